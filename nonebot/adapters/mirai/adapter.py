@@ -1,27 +1,69 @@
-import json
+import random
 import asyncio
 from typing_extensions import override
-from weakref import WeakValueDictionary
-from collections.abc import MutableMapping
-from typing import Any, Union, Literal, Optional, overload
+from dataclasses import field, dataclass
+from typing import Any, Union, Literal, Optional, cast, overload
 
 from nonebot.utils import escape_tag
 from nonebot.exception import WebSocketClosed
-from nonebot.compat import type_validate_python
-from nonebot.drivers import Driver, Request, WebSocket, HTTPClientMixin, WebSocketClientMixin
+from nonebot.drivers import (
+    Driver,
+    Request,
+    WebSocket,
+    HTTPClientMixin,
+    HTTPClientSession,
+    WebSocketClientMixin,
+)
 
 from nonebot import get_plugin_config
 from nonebot.adapters import Adapter as BaseAdapter
 
 from .bot import Bot
 from .model import ModelBase
+from .compat import model_validate
 from .config import Config, ClientInfo
 from .event import EVENT_CLASSES, Event
-from .utils import API, DatetimeJsonEncoder, log, exclude_none
-from .exception import ActionFailed, ApiNotAvailable, RemoteException, code_exceptions_mapping
+from .utils import API, log, json_dumps, json_loads, debug_enabled, json_dumps_str
+from .exception import ActionFailed, NetworkError, ApiNotAvailable, RemoteException, code_exceptions_mapping
 
 CallMethod = Literal["get", "post", "multipart"]
 
+_SUB_COMMANDS: dict[str, str] = {"get": "get", "post": "update"}
+"""调用方法到 websocket `subCommand` 的映射"""
+
+
+def _is_success(data: Any) -> bool:
+    """判断响应是否成功, 即不含错误状态码"""
+    code = data.get("code") if isinstance(data, dict) else data
+    return not isinstance(code, int) or code == 200 or code == 0
+
+
+def _response_exception(data: Any) -> Exception:
+    """根据响应的错误状态码构造对应异常"""
+    int_code: int = data.get("code") if isinstance(data, dict) else data
+    exc_cls = code_exceptions_mapping.get(int_code)
+    if exc_cls:
+        return exc_cls(exc_cls.__doc__ or exc_cls.__name__, int_code, content=str(data))
+    return RemoteException(RemoteException.__doc__ or "", int_code, content=str(data))
+
+
+@dataclass
+class AccountState:
+    """单个账号的连接状态"""
+
+    bot: Bot
+    """账号对应的 Bot"""
+    ws: WebSocket
+    """当前的 websocket 连接"""
+    session_key: Optional[str] = None
+    """当前连接的 sessionKey"""
+    waiters: dict[str, asyncio.Future] = field(default_factory=dict)
+    """等待响应的 API 调用, 以 syncId 为键"""
+    event_queue: "asyncio.Queue[Optional[Event]]" = field(default_factory=asyncio.Queue)
+    """待处理的事件, 仅在启用事件处理 worker 时使用"""
+    workers: list[asyncio.Task] = field(default_factory=list)
+    """处理事件的 worker 任务"""
+
 
 class Adapter(BaseAdapter):
     bots: dict[str, Bot]
@@ -32,9 +74,9 @@ class Adapter(BaseAdapter):
         # 读取适配器所需的配置项
         self.mirai_config: Config = get_plugin_config(Config)
         self.tasks: list[asyncio.Task] = []  # 存储 ws 任务
-        self.response_waiters: dict[int, MutableMapping[str, asyncio.Future]] = {}
-        self.session_keys: dict[int, str] = {}
-        self.wss: dict[int, WebSocket] = {}
+        self.accounts: dict[int, AccountState] = {}  # 已连接账号的状态
+        self.event_tasks: set[asyncio.Task] = set()  # 处理事件的任务与 worker, 保持引用以免被回收
+        self.http_session: Optional[HTTPClientSession] = None  # 复用连接的 HTTP 会话
         self.setup()
 
     @classmethod
@@ -63,6 +105,10 @@ class Adapter(BaseAdapter):
 
     async def startup(self) -> None:
         """定义启动时的操作，例如和平台建立连接"""
+        if not all(client.only_ws for client in self.mirai_config.mirai_clients):
+            session = cast(HTTPClientMixin, self.driver).get_session()
+            await session.setup()
+            self.http_session = session
         for client in self.mirai_config.mirai_clients:
             self.tasks.append(asyncio.create_task(self.ws(client)))
 
@@ -71,10 +117,14 @@ class Adapter(BaseAdapter):
             if not task.done():
                 task.cancel()
 
-        await asyncio.gather(
-            *(asyncio.wait_for(task, timeout=10) for task in self.tasks),
-            return_exceptions=True,
-        )
+        try:
+            await asyncio.wait_for(asyncio.gather(*self.tasks, return_exceptions=True), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+
+        if self.http_session is not None:
+            session, self.http_session = self.http_session, None
+            await session.close()
 
     @staticmethod
     @overload
@@ -86,15 +136,9 @@ class Adapter(BaseAdapter):
 
     @staticmethod
     def validate_response(data: dict, raising: bool = True):
-        int_code = data.get("code") if isinstance(data, dict) else data
-        if not isinstance(int_code, int) or int_code == 200 or int_code == 0:
+        if _is_success(data):
             return data.get("data", data)
-        exc_cls = code_exceptions_mapping.get(int_code)
-        exc = (
-            exc_cls(exc_cls.__doc__ or exc_cls.__name__, int_code, content=str(data))
-            if exc_cls
-            else RemoteException(RemoteException.__doc__ or "", int_code, content=str(data))
-        )
+        exc = _response_exception(data)
         if raising:
             raise exc
         return exc
@@ -102,9 +146,11 @@ class Adapter(BaseAdapter):
     async def ws(self, info: ClientInfo) -> None:
         ws_url = info.ws_url()
         req = Request("GET", ws_url, timeout=60.0)
+        backoff = 1.0  # 重连间隔, 连接失败时指数增长
         while True:
             try:
                 async with self.websocket(req) as ws:
+                    backoff = 1.0
                     log(
                         "DEBUG",
                         f"WebSocket Connection to " f"{escape_tag(str(ws_url))} established",
@@ -116,12 +162,16 @@ class Adapter(BaseAdapter):
                             "INFO",
                             f"<y>Bot {escape_tag(bot.self_id)}</y> connected",
                         )
-                        self.response_waiters.setdefault(info.account, WeakValueDictionary())
                     else:
                         bot = self.bots[str(info.account)]
-                    self.wss[info.account] = ws
+                    state = self.accounts[info.account] = AccountState(bot, ws)
+                    for _ in range(self.mirai_config.mirai_event_workers):
+                        worker = asyncio.create_task(self._dispatch(bot, state.event_queue))
+                        state.workers.append(worker)
+                        self.event_tasks.add(worker)
+                        worker.add_done_callback(self.event_tasks.discard)
                     try:
-                        await self._loop(info, ws)
+                        await self._loop(state)
                     except WebSocketClosed as e:
                         log(
                             "ERROR",
@@ -138,67 +188,125 @@ class Adapter(BaseAdapter):
                         )
                     finally:
                         self.bot_disconnect(bot)
-                        self.wss.pop(info.account, None)
+                        if self.accounts.get(info.account) is state:
+                            del self.accounts[info.account]
+                        # 不中断正在运行的事件处理器, worker 处理完队列中剩余的事件后结束
+                        for _ in state.workers:
+                            state.event_queue.put_nowait(None)
+                        # 连接断开后不会再收到响应, 使等待中的调用失败
+                        for future in state.waiters.values():
+                            if not future.done():
+                                future.set_exception(NetworkError("WebSocket connection closed"))
+                        state.waiters.clear()
             except Exception as e:
+                # 网络异常在连接不稳定时会频繁出现, 非 DEBUG 日志级别下仅输出异常信息而不格式化堆栈
+                network_error = isinstance(e, (OSError, asyncio.TimeoutError))
+                brief = network_error and not debug_enabled(self.config.log_level)
                 log(
                     "ERROR",
                     (
                         "<r><bg #f8bbd0>"
                         "Error while setup websocket to "
                         f"{escape_tag(str(ws_url))}. Trying to reconnect..."
-                        "</bg #f8bbd0></r>"
+                        "</bg #f8bbd0></r>" + (f" {escape_tag(repr(e))}" if brief else "")
                     ),
+                    None if brief else e,
+                )
+                # 加入随机抖动, 避免多个客户端同时重连
+                await asyncio.sleep(backoff + random.uniform(0, backoff))
+                backoff = min(backoff * 2, 60.0)
+
+    async def _dispatch(self, bot: Bot, queue: "asyncio.Queue[Optional[Event]]"):
+        """从事件队列中取出事件并交由 Bot 处理, 取出 `None` 时结束"""
+        while (event := await queue.get()) is not None:
+            try:
+                await bot.handle_event(event)
+            except Exception as e:
+                log(
+                    "ERROR",
+                    f"<r><bg #f8bbd0>Error while handling event {escape_tag(str(event))}</bg #f8bbd0></r>",
                     e,
                 )
-                await asyncio.sleep(5)  # 重连间隔
 
-    async def _loop(self, info: ClientInfo, ws: WebSocket):
+    async def _loop(self, state: AccountState):
+        ws = state.ws
+        account = state.bot.info.account
+        waiters = state.waiters
+        bot = state.bot
+        events = state.event_queue
+        max_events = self.mirai_config.mirai_event_queue_size
+        event_tasks = self.event_tasks
+        to_event = self.json_to_event
         while True:
-            data: dict[str, Any] = json.loads(await ws.receive())
-            if "code" in data:
-                self.validate_response(data)
-
-            sync_id: str = data.get("syncId", "#")
-            body: Union[dict, Exception] = self.validate_response(data.get("data"), False)
-            if isinstance(body, Exception):
-                if sync_id in self.response_waiters[info.account]:
-                    self.response_waiters[info.account][sync_id].set_exception(body)
-                continue
-
-            if "session" in body:
-                self.session_keys[info.account] = body["session"]
+            data: dict[str, Any] = json_loads(await ws.receive())
+            body: dict = data.get("data")  # type: ignore
+            # 握手消息直接记录 sessionKey, 无需进行响应校验
+            if isinstance(body, dict) and "session" in body and _is_success(body):
+                state.session_key = body["session"]
                 log(
                     "SUCCESS",
-                    f"<y>Bot {info.account}</y> session key got.",
+                    f"<y>Bot {account}</y> session key got.",
                 )
                 continue
 
-            if sync_id in self.response_waiters[info.account]:
-                self.response_waiters[info.account][sync_id].set_result(body)
+            if "code" in data and not _is_success(data):
+                raise _response_exception(data)
+
+            sync_id: str = data.get("syncId", "#")
+            if _is_success(body):
+                body = body.get("data", body)
+            else:
+                if (future := waiters.pop(sync_id, None)) is not None:
+                    future.set_exception(_response_exception(body))
+                continue
+
+            if (future := waiters.pop(sync_id, None)) is not None:
+                future.set_result(body)
                 continue
 
             if "type" not in body:
                 continue
 
-            event_type = body.pop("type")
-            if event_type not in EVENT_CLASSES:
+            event = to_event(body)
+            if not state.workers:
+                task = asyncio.create_task(bot.handle_event(event))
+                event_tasks.add(task)
+                task.add_done_callback(event_tasks.discard)
+                continue
+            if events.qsize() >= max_events:
                 log(
                     "WARNING",
-                    f"received unsupported event <r><bg #f8bbd0>{event_type}</bg #f8bbd0></r>: {body}",
+                    f"<y>Bot {account}</y> event queue is full, "
+                    f"dropping event <r><bg #f8bbd0>{event.__event_type__}</bg #f8bbd0></r>",
                 )
-                event = type_validate_python(Event, body)
-                event.__event_type__ = event_type  # type: ignore
-            else:
-                event = type_validate_python(EVENT_CLASSES[event_type], body)
-            bot = self.bots[str(info.account)]
-            asyncio.create_task(bot.handle_event(event))
+                continue
+            events.put_nowait(event)
+
+    @classmethod
+    def json_to_event(cls, data: dict[str, Any]) -> Event:
+        """将事件数据转换为对应的事件模型, `data` 中的 `type` 字段会被移除"""
+        # 事件模型允许额外字段, 需移除 type 以免其成为事件属性
+        event_type = data.pop("type")
+        if (event_cls := EVENT_CLASSES.get(event_type)) is not None:
+            return model_validate(event_cls, data)
+        log(
+            "WARNING",
+            f"received unsupported event <r><bg #f8bbd0>{event_type}</bg #f8bbd0></r>: {data}",
+        )
+        event = model_validate(Event, data)
+        event.__event_type__ = event_type  # type: ignore
+        return event
 
     @override
     async def _call_api(self, bot: Bot, api: str, **data: Any) -> Any:
-        log("DEBUG", f"Bot {bot.self_id} calling API <y>{api}</y>")
-        api_handler: Optional[API] = getattr(bot.__class__, api, None)
+        if debug_enabled(self.config.log_level):
+            log("DEBUG", f"Bot {bot.self_id} calling API <y>{api}</y>")
+        api_handler: Optional[API] = bot._api_handlers.get(api)
         if api_handler is None:
-            raise ApiNotAvailable(api)
+            # 未使用 API 装饰的方法 (如 send_message) 仍可通过名称调用
+            api_handler = getattr(bot.__class__, api, None)
+            if api_handler is None:
+                raise ApiNotAvailable(api)
         return await api_handler(bot, **data)
 
     async def call(
@@ -217,33 +325,30 @@ class Adapter(BaseAdapter):
         *,
         session: bool = True,
     ) -> dict:
-        if not (ws := self.wss.get(bot.info.account)):
+        if (state := self.accounts.get(bot.info.account)) is None:
             raise RuntimeError("connection is not established")
-        if session and not self.session_keys.get(bot.info.account):
+        if session and not state.session_key:
             raise RuntimeError("No session key available.")
 
         if method == "multipart":
             return await self._call_http(bot, action, method, params)
 
         future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
-        echo = str(hash(future))
-        self.response_waiters[bot.info.account][echo] = future
+        echo = str(id(future))
+        state.waiters[echo] = future
         data = {
-            "subCommand": {
-                "fetch": "get",
-                "post": "update",
-            }.get(method)
-            or method,
+            "subCommand": _SUB_COMMANDS.get(method, method),
             "syncId": echo,
             "command": action,
             "content": params or {},
-            **({"sessionKey": self.session_keys[bot.info.account]} if session else {}),
         }
+        if session:
+            data["sessionKey"] = state.session_key
         try:
-            await ws.send(json.dumps(data, cls=DatetimeJsonEncoder))
+            await state.ws.send(json_dumps_str(data))
             return await future
         finally:
-            del self.response_waiters[bot.info.account][echo]
+            state.waiters.pop(echo, None)
 
     async def _call_http(
         self,
@@ -254,30 +359,20 @@ class Adapter(BaseAdapter):
         *,
         session: bool = True,
     ) -> dict:
-        if session and not self.session_keys.get(bot.info.account):
+        state = self.accounts.get(bot.info.account)
+        if session and (state is None or not state.session_key):
             raise RuntimeError("No session key available.")
-        action = action.replace("_", "/")
-        data = exclude_none(params or {})
-        data = {k: v.dict_() if isinstance(v, ModelBase) else v for k, v in data.items()}
-        if session:
-            data["sessionKey"] = self.session_keys[bot.info.account]
-        if method == "get":
-            req = Request(
-                "GET",
-                bot.info.get_url(action),
-                params=data,  # type: ignore
-            )
-        elif method == "post":
-            req = Request(
-                "POST",
-                bot.info.get_url(action),
-                json=data,
-            )
-        else:
+        url = bot.info.api_url(action)
+        if method == "multipart":
             if params is None:
                 raise TypeError("multipart requires params")
-            files = {}
-            for k, v in data.items():
+            # 直接构造表单字段, 无需中间的 data 字典
+            files: dict[str, Any] = {}
+            for k, v in params.items():
+                if v is None:
+                    continue
+                if isinstance(v, ModelBase):
+                    v = v.dict_()
                 if isinstance(v, dict):
                     files[k] = (
                         v.get("filename"),
@@ -285,23 +380,49 @@ class Adapter(BaseAdapter):
                         v.get("content_type"),
                     )
                 elif isinstance(v, list):
-                    files[k] = (None, json.dumps(v).encode("utf-8"), "application/json")
+                    files[k] = (None, json_dumps(v), "application/json")
                 else:
                     files[k] = (None, v, None)
+            if session:
+                files["sessionKey"] = (None, state.session_key, None)  # type: ignore
             req = Request(
                 "POST",
-                bot.info.get_url(action),
+                url,
                 files=files,
             )
+        else:
+            data: dict[str, Any] = {}
+            if params:
+                for k, v in params.items():
+                    if v is None:
+                        continue
+                    data[k] = v.dict_() if isinstance(v, ModelBase) else v
+            if session:
+                data["sessionKey"] = state.session_key  # type: ignore
+            if method == "get":
+                req = Request(
+                    "GET",
+                    url,
+                    params=data,  # type: ignore
+                )
+            else:
+                # 使用适配器的 JSON 序列化, 以便在安装 orjson 时使用 orjson
+                req = Request(
+                    "POST",
+                    url,
+                    headers={"Content-Type": "application/json"},
+                    content=json_dumps(data),
+                )
 
         try:
-            response = await self.request(req)
+            http = self.http_session
+            response = await (self.request(req) if http is None else http.request(req))
         except Exception as e:
             raise RemoteException(repr(e), 500) from e
         if not response.content:
             raise ActionFailed("Empty response", response.status_code, response.headers, response.content)
         try:
-            data = json.loads(response.content)
+            data = json_loads(response.content)
         except Exception:
             raise ActionFailed("Invalid response", response.status_code, response.headers, response.content)
         return self.validate_response(data)
@@ -1,22 +1,28 @@
 import io
 import os
 import re
+import time
 import base64
+import asyncio
 from enum import Enum
 from datetime import datetime
+from operator import attrgetter
 from typing_extensions import override
 from collections.abc import Iterable, AsyncGenerator
-from typing import IO, TYPE_CHECKING, Any, Union, Optional, cast, overload
+from contextlib import AbstractContextManager, nullcontext
+from typing import IO, TYPE_CHECKING, Any, Union, TypeVar, Callable, ClassVar, Optional, cast, overload
 
 from nonebot.message import handle_event
-from nonebot.compat import type_validate_python
 from nonebot.internal.matcher import current_event
+from nonebot.compat import model_fields, type_validate_python
 
 from nonebot.adapters import Bot as BaseBot
 
 from .config import ClientInfo
-from .utils import API, log, camel_to_snake
+from .exception import UnknownTarget
+from .utils import API, log, camel_to_snake, snake_to_camel
 from .message import Image, Video, Voice, Message, MessageSegment
+from .compat import model_validate, type_validator, model_construct
 from .model import (
     Group,
     Friend,
@@ -41,9 +47,18 @@ from .event import (
     MessageEvent,
     ActiveMessage,
     FriendMessage,
+    FriendAddEvent,
     ActiveTempMessage,
+    BotJoinGroupEvent,
+    BotLeaveEventKick,
+    FriendDeleteEvent,
     ActiveGroupMessage,
     ActiveFriendMessage,
+    BotLeaveEventActive,
+    BotLeaveEventDisband,
+    GroupNameChangeEvent,
+    FriendNickChangedEvent,
+    BotGroupPermissionChangeEvent,
 )
 
 if TYPE_CHECKING:
@@ -66,54 +81,199 @@ class UploadMethod(str, Enum):
         return self.value
 
 
+T = TypeVar("T")
+
+
+def _lookup_by_type(table: dict[type, T], cls: type) -> Optional[T]:
+    """按类型查找表项, 未直接命中时按表中顺序匹配父类, 并缓存匹配结果"""
+    if (value := table.get(cls)) is None:
+        value = next((v for base, v in table.items() if issubclass(cls, base)), None)
+        if value is not None:
+            table[cls] = value
+    return value
+
+
+_REPLY_TARGETS: dict[type, Callable[[Any], Any]] = {
+    MessageEvent: lambda event: event,
+    FriendEvent: attrgetter("friend"),
+    GroupEvent: attrgetter("group"),
+    MemberEvent: attrgetter("group"),
+    NudgeEvent: attrgetter("subject"),
+}
+"""事件类型到其回复目标的获取方式"""
+
+_SEND_METHODS: dict[type, str] = {
+    Friend: "send_friend_message",
+    Group: "send_group_message",
+    Member: "send_temp_message",
+}
+"""消息目标类型到对应发送 API 的映射"""
+
+_MESSAGE_TARGETS: dict[type, Callable[[Any], Any]] = {
+    GroupMessage: attrgetter("sender.group"),
+    MessageEvent: attrgetter("sender"),
+    ActiveMessage: attrgetter("subject"),
+}
+"""消息事件类型到消息所在目标的获取方式"""
+
+_GROUP_MESSAGE_TARGETS: dict[type, Callable[[Any], Any]] = {
+    GroupMessage: attrgetter("sender.group"),
+    ActiveGroupMessage: attrgetter("subject"),
+}
+"""群消息事件类型到消息所在群组的获取方式"""
+
+
+def _resolve_message_target(
+    bot: "Bot", message: Any, target: Any, table: dict[type, Callable[[Any], Any]]
+) -> int:
+    """确定消息所在目标的 ID, 依次尝试显式指定的目标, 消息事件本身与当前处理的事件"""
+    if not target:
+        if (get_target := _lookup_by_type(table, type(message))) is not None:
+            target = get_target(message)
+        # 仅在消息本身无法确定目标时读取当前事件
+        elif (get_target := _lookup_by_type(table, type(event := current_event.get(None)))) is not None:
+            target = get_target(event)
+        else:
+            raise ValueError("target is required in version 2.6.0+")
+    # 其他客户端的消息以 Bot 自身账号作为目标
+    return bot.self_id_int if isinstance(target, OtherClient) else int(target)
+
+
+_FRIEND_CHANGE_EVENTS = (FriendAddEvent, FriendDeleteEvent, FriendNickChangedEvent)
+"""会使好友列表缓存失效的事件"""
+
+_GROUP_CHANGE_EVENTS = (
+    BotJoinGroupEvent,
+    BotLeaveEventActive,
+    BotLeaveEventKick,
+    BotLeaveEventDisband,
+    GroupNameChangeEvent,
+    BotGroupPermissionChangeEvent,
+)
+"""会使群组列表缓存失效的事件, 包括会改变 `Group.name` 与 `Group.permission` 的事件"""
+
+_MESSAGE_EVENT_TYPES: dict[type, bool] = {}
+"""事件类型是否为消息事件的缓存"""
+
+
+def _is_message_event(cls: type) -> bool:
+    """判断事件类型是否为消息事件, 结果按类型缓存以避免每次都经过 ABCMeta 的子类检查"""
+    if (result := _MESSAGE_EVENT_TYPES.get(cls)) is None:
+        result = _MESSAGE_EVENT_TYPES[cls] = issubclass(cls, MessageEvent)
+    return result
+
+
+_MAX_KNOWN_MEMBERS = 1024
+"""缓存的群成员发送目标数量上限, 超出时移除最早加入的项"""
+
+
+_validate_friend_list: Callable[[Any], list[Friend]] = type_validator(list[Friend])
+_validate_group_list: Callable[[Any], list[Group]] = type_validator(list[Group])
+_validate_member_list: Callable[[Any], list[Member]] = type_validator(list[Member])
+_validate_file_list: Callable[[Any], list[FileInfo]] = type_validator(list[FileInfo])
+_validate_announcement_list: Callable[[Any], list[Announcement]] = type_validator(list[Announcement])
+_validate_friend_message_list: Callable[[Any], list[FriendMessage]] = type_validator(list[FriendMessage])
+"""列表结果的校验函数, 整个列表一次完成校验"""
+
+_GROUP_CONFIG_KEYS: dict[str, str] = {snake_to_camel(f.name): f.name for f in model_fields(GroupConfig)}
+"""群设置接口返回的 camelCase 键到 GroupConfig 字段名的映射"""
+
+
+A = TypeVar("A", bound=ActiveMessage)
+
+
+def _active_message(cls: type[A], message: Message, elements: list[dict], message_id: int, subject: Any) -> A:
+    """由已发送的消息直接构造主动消息事件, 无需重新解析消息链与校验字段"""
+    sent = message.exclude("$mirai:reply", "source", "quote")
+    return model_construct(
+        cls,
+        raw_message=elements,
+        message_id=message_id,
+        subject=subject,
+        message=sent,
+        original_message=sent._snapshot(),
+    )
+
+
+async def _open_file(data: Any) -> AbstractContextManager[Any]:
+    """若为路径则在线程中以二进制模式打开文件, 并在使用完毕后关闭; 否则原样返回"""
+    if isinstance(data, os.PathLike):
+        return await asyncio.to_thread(open, data, "rb")
+    return nullcontext(data)
+
+
+_B64_CHUNK_SIZE = 3 << 16
+"""分块编码 base64 时每次读取的字节数"""
+
+
+def _b64encode_file(file: Union[IO[bytes], os.PathLike]) -> str:
+    """分块读取并编码文件, 避免同时持有完整的原始数据与编码结果"""
+    if isinstance(file, os.PathLike):
+        with open(file, "rb") as f:
+            return _b64encode_file(f)
+    encoded = bytearray()
+    pending = b""
+    while chunk := file.read(_B64_CHUNK_SIZE):
+        # 读取的字节数不一定为 3 的倍数, 余下的字节留到下一块一同编码, 以免在中间产生填充
+        if pending:
+            chunk = pending + chunk
+        split = len(chunk) - len(chunk) % 3
+        encoded += base64.b64encode(memoryview(chunk)[:split])
+        pending = chunk[split:]
+    encoded += base64.b64encode(pending)
+    return encoded.decode("ascii")
+
+
 def _check_reply(
     bot: "Bot",
     event: MessageEvent,
+    message: Message,
 ) -> None:
     """检查消息中存在的回复，赋值 `event.to_me`。
 
     参数:
         bot: Bot 对象
         event: MessageEvent 对象
+        message: 事件的消息
     """
     if not event.reply:
         return
-    if event.reply.sender == int(bot.self_id):
+    self_id = bot.self_id_int
+    if event.reply.sender == self_id:
         event.to_me = True
-    message = event.get_message()
-    if message and message[0].type == "at" and message[0].data.get("target") == int(bot.self_id):
+    # 记录需要移除的开头元素数量, 最后一次性删除
+    head = 0
+    if message and message[0].type == "at" and message[0].data.get("target") == self_id:
         event.to_me = True
-        del message[0]
-    if message and message[0].type == "text":
-        message[0].data["text"] = message[0].data["text"].lstrip()
-        if not message[0].data["text"]:
-            del message[0]
-    if not message:
-        message.append(MessageSegment.text(""))
+        head = 1
+    if head < len(message) and message[head].type == "text":
+        text = message[head].data["text"] = message[head].data["text"].lstrip()
+        if not text:
+            head += 1
+    if head:
+        del message[:head]
 
 
 def _check_at_me(
     bot: "Bot",
     event: MessageEvent,
+    message: Message,
 ):
-    def _is_at_me_seg(segment: MessageSegment) -> bool:
-        return segment.type == "at" and segment.data.get("target") == int(bot.self_id)
-
-    message = event.get_message()
-
-    # ensure message is not empty
+    self_id = bot.self_id_int
     if not message:
-        message.append(MessageSegment.text(""))
+        return
 
     deleted = False
-    if _is_at_me_seg(message[0]):
-        message.pop(0)
+    first_msg_seg = message[0]
+    if first_msg_seg.type == "at" and first_msg_seg.data.get("target") == self_id:
         event.to_me = True
         deleted = True
-        if message and message[0].type == "text":
-            message[0].data["text"] = message[0].data["text"].lstrip("\xa0").lstrip()
-            if not message[0].data["text"]:
-                del message[0]
+        head = 1
+        if len(message) > 1 and message[1].type == "text":
+            text = message[1].data["text"] = message[1].data["text"].lstrip()
+            if not text:
+                head = 2
+        del message[:head]
 
     if not deleted:
         # check the last segment
@@ -123,41 +283,64 @@ def _check_at_me(
             i -= 1
             last_msg_seg = message[i]
 
-        if _is_at_me_seg(last_msg_seg):
+        if last_msg_seg.type == "at" and last_msg_seg.data.get("target") == self_id:
             event.to_me = True
             del message[i:]
 
-    if not message:
-        message.append(MessageSegment.text(""))
 
+_NICKNAME_SEPARATOR = re.compile(r"[\s,，]*")
+"""昵称后可跟随的分隔符"""
+
+_nickname_cache: tuple[frozenset[str], tuple[tuple[int, str], ...]] = (frozenset(), ())
+"""上次使用的昵称配置, 及按长度降序排列的昵称长度与小写形式"""
+
+
+def _nickname_prefixes(nicknames: Iterable[str]) -> tuple[tuple[int, str], ...]:
+    """获取按长度降序排列的昵称长度与小写形式, 昵称配置未变化时复用已有结果"""
+    global _nickname_cache
+    if nicknames != _nickname_cache[0]:
+        names = frozenset(nicknames)
+        _nickname_cache = (names, tuple(sorted(((len(n), n.lower()) for n in names), reverse=True)))
+    return _nickname_cache[1]
 
-def _check_nickname(bot: "Bot", event: MessageEvent) -> None:
+
+def _check_nickname(bot: "Bot", event: MessageEvent, message: Message) -> None:
     """检查消息开头是否存在昵称，去除并赋值 `event.to_me`。
 
     参数:
         bot: Bot 对象
         event: MessageEvent 对象
+        message: 事件的消息
     """
-    message = event.get_message()
     first_msg_seg = message[0]
     if first_msg_seg.type != "text":
         return
 
-    nicknames = {re.escape(n) for n in bot.config.nickname}
-    if not nicknames:
-        return
-
-    # check if the user is calling me with my nickname
-    nickname_regex = "|".join(nicknames)
     first_text = first_msg_seg.data["text"]
-    if m := re.search(rf"^({nickname_regex})([\s,，]*|$)", first_text, re.IGNORECASE):
-        log("DEBUG", f"User is calling me {m[1]}")
-        event.to_me = True
-        first_msg_seg.data["text"] = first_text[m.end() :]
+    # check if the user is calling me with my nickname, longer nicknames first
+    for length, nickname in _nickname_prefixes(bot.config.nickname):
+        if first_text[:length].lower() == nickname:
+            log("DEBUG", f"User is calling me {first_text[:length]}")
+            event.to_me = True
+            first_msg_seg.data["text"] = first_text[_NICKNAME_SEPARATOR.match(first_text, length).end() :]  # type: ignore
+            return
 
 
 class Bot(BaseBot):
     adapter: "Adapter"
+    _api_handlers: ClassVar[dict[str, API]]
+    """API 名称到其实现的映射, 由 `API` 在类创建时填充"""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # 子类以普通方法覆盖 API 时移除继承的登记, 使调用按名称查找到子类的实现
+        overridden = {
+            name
+            for name in cls._api_handlers
+            if name in cls.__dict__ and not isinstance(cls.__dict__[name], API)
+        }
+        if overridden:
+            cls._api_handlers = {k: v for k, v in cls._api_handlers.items() if k not in overridden}
 
     @override
     def __init__(self, adapter: "Adapter", info: ClientInfo):
@@ -165,17 +348,55 @@ class Bot(BaseBot):
 
         # Bot 配置信息
         self.info: ClientInfo = info
+        # 整数形式的账号, 用于与消息中的 QQ 号比较
+        self.self_id_int: int = info.account
+        # 已知的消息发送目标, 用于构造主动消息事件时避免重复请求
+        self._friends: dict[int, Friend] = {}
+        self._groups: dict[int, Group] = {}
+        self._members: dict[tuple[int, int], Member] = {}
+        # 好友与群组列表缓存, 记录获取时间及以 ID 为键的列表, 未校验的项保留原始数据
+        self._friend_cache: Optional[tuple[float, dict[int, Union[Friend, dict]]]] = None
+        self._group_cache: Optional[tuple[float, dict[int, Union[Group, dict]]]] = None
+        # Mirai API HTTP 版本, 连接期间不会变化, 首次使用时获取
+        self._version: Optional[tuple[int, ...]] = None
+        # 消息相关接口是否需要指定 target (2.6.0+), 随版本一同缓存
+        self._message_target: Optional[bool] = None
+        # 进行中的幂等查询请求, 并发的相同请求共享同一次调用
+        self._inflight: dict[tuple, asyncio.Task] = {}
 
     def __getattr__(self, item):
         raise AttributeError(f"'Bot' object has no attribute '{item}'")
 
     async def handle_event(self, event: Event) -> None:
-        if isinstance(event, MessageEvent):
-            _check_reply(self, event)
-            _check_at_me(self, event)
-            _check_nickname(self, event)
+        if _is_message_event(type(event)):
+            event = cast(MessageEvent, event)
+            message = event.get_message()
+            _check_reply(self, event, message)
+            _check_at_me(self, event, message)
+            # 去除回复与提及后确保消息不为空
+            if not message:
+                message.append(MessageSegment.text(""))
+            if self.config.nickname:
+                _check_nickname(self, event, message)
+        elif isinstance(event, _FRIEND_CHANGE_EVENTS):
+            self.invalidate_friend_cache()
+        elif isinstance(event, _GROUP_CHANGE_EVENTS):
+            self.invalidate_group_cache()
+        elif isinstance(event, MemberEvent):
+            # 成员信息可能已变化, 下次发送时重新获取
+            self._members.pop((event.group.id, event.member.id), None)
         await handle_event(self, event)
 
+    def invalidate_friend_cache(self) -> None:
+        """使好友列表缓存失效"""
+        self._friend_cache = None
+        self._friends.clear()
+
+    def invalidate_group_cache(self) -> None:
+        """使群组列表缓存失效"""
+        self._group_cache = None
+        self._groups.clear()
+
     @override
     async def send(
         self,
@@ -183,16 +404,9 @@ class Bot(BaseBot):
         message: Union[str, Message, MessageSegment],
         **kwargs,
     ) -> ActiveMessage:
-        if isinstance(event, MessageEvent):
-            return await self.send_message(event, message, **kwargs)
-        if isinstance(event, FriendEvent):
-            return await self.send_message(event.friend, message, **kwargs)
-        if isinstance(event, (GroupEvent, MemberEvent)):
-            return await self.send_message(event.group, message, **kwargs)
-        if isinstance(event, NudgeEvent):
-            return await self.send_message(event.subject, message, **kwargs)  # type: ignore
-        else:
+        if (get_target := _lookup_by_type(_REPLY_TARGETS, type(event))) is None:
             raise TypeError(event)
+        return await self.send_message(get_target(event), message, **kwargs)
 
     @overload
     async def send_message(
@@ -227,7 +441,6 @@ class Bot(BaseBot):
         Returns:
             ActiveMessage: Bot 主动消息对象
         """
-        _message = Message(message)
         _quote = None
         if isinstance(quote, bool):
             if quote:
@@ -237,11 +450,9 @@ class Bot(BaseBot):
                     raise TypeError("Passing `quote=True` is only valid when passing a MessageEvent.")
         elif isinstance(quote, int):
             _quote = quote
-        elif _message.has("$mirai:reply"):
-            _quote = _message.get("$mirai:reply")[0].data["id"]
-            _message = _message.exclude("$mirai:reply")
+        # 消息中的回复元素由具体的发送 API 处理
         params: dict = {
-            "message": _message,
+            "message": message,
             "quote": _quote,
         }
         if isinstance(target, GroupMessage):
@@ -250,15 +461,9 @@ class Bot(BaseBot):
             params["target"] = target.sender
         else:  # target: sender
             params["target"] = target
-        if isinstance(params["target"], Friend):
-            result = await self.send_friend_message(**params)
-        elif isinstance(params["target"], Group):
-            result = await self.send_group_message(**params)
-        elif isinstance(params["target"], Member):
-            result = await self.send_temp_message(**params)
-        else:
+        if (api := _lookup_by_type(_SEND_METHODS, type(params["target"]))) is None:
             raise ValueError("Invalid target")
-        return result
+        return await getattr(self, api)(**params)
 
     @API
     async def send_friend_message(
@@ -279,30 +484,23 @@ class Bot(BaseBot):
             ActiveFriendMessage: 即当前会话账号所发出消息的事件, 可用于回复.
         """
 
-        _message = Message(message)
-        _quote = quote
-        if _message.has("$mirai:reply"):
-            _quote = _message.get("$mirai:reply")[0].data["id"]
-            _message = _message.exclude("$mirai:reply")
-        _message = _message.exclude("source", "quote")
+        _message = message if isinstance(message, Message) else Message(message)
+        reply_id, elements = _message._to_send_elements()
+        _quote = quote if reply_id is None else reply_id
 
-        result = await self.adapter.call(
-            self,
-            "sendFriendMessage",
-            "post",
-            {
-                "target": int(target),
-                "messageChain": _message.to_elements(),
-                **({"quote": _quote} if _quote else {}),
-            },
-        )
-        return type_validate_python(
+        params = {
+            "target": int(target),
+            "messageChain": elements,
+        }
+        if _quote:
+            params["quote"] = _quote
+        result = await self.adapter.call(self, "sendFriendMessage", "post", params)
+        return _active_message(
             ActiveFriendMessage,
-            {
-                "messageChain": message,
-                "message_id": result["messageId"],
-                "subject": target if isinstance(target, Friend) else await self.get_friend(target=target),
-            },
+            _message,
+            elements,
+            result["messageId"],
+            target if isinstance(target, Friend) else await self._known_friend(int(target)),
         )
 
     @API
@@ -323,33 +521,26 @@ class Bot(BaseBot):
         Returns:
             ActiveGroupMessage: 即当前会话账号所发出消息的事件, 可用于回复.
         """
-        _message = Message(message)
-        _quote = quote
-        if _message.has("$mirai:reply"):
-            _quote = _message.get("$mirai:reply")[0].data["id"]
-            _message = _message.exclude("$mirai:reply")
-        _message = _message.exclude("source", "quote")
+        _message = message if isinstance(message, Message) else Message(message)
+        reply_id, elements = _message._to_send_elements()
+        _quote = quote if reply_id is None else reply_id
 
         if isinstance(target, Member):
             target = target.group
 
-        result = await self.adapter.call(
-            self,
-            "sendGroupMessage",
-            "post",
-            {
-                "target": int(target),
-                "messageChain": _message.to_elements(),
-                **({"quote": _quote} if _quote else {}),
-            },
-        )
-        return type_validate_python(
+        params = {
+            "target": int(target),
+            "messageChain": elements,
+        }
+        if _quote:
+            params["quote"] = _quote
+        result = await self.adapter.call(self, "sendGroupMessage", "post", params)
+        return _active_message(
             ActiveGroupMessage,
-            {
-                "messageChain": message,
-                "message_id": result["messageId"],
-                "subject": target if isinstance(target, Group) else await self.get_group(target=int(target)),
-            },
+            _message,
+            elements,
+            result["messageId"],
+            target if isinstance(target, Group) else await self._known_group(int(target)),
         )
 
     @API
@@ -375,38 +566,27 @@ class Bot(BaseBot):
         Returns:
             ActiveTempMessage: 即当前会话账号所发出消息的事件, 可用于回复.
         """
-        _message = Message(message)
-        _quote = quote
-        if _message.has("$mirai:reply"):
-            _quote = _message.get("$mirai:reply")[0].data["id"]
-            _message = _message.exclude("$mirai:reply")
-        _message = _message.exclude("source", "quote")
+        _message = message if isinstance(message, Message) else Message(message)
+        reply_id, elements = _message._to_send_elements()
+        _quote = quote if reply_id is None else reply_id
         group = target.group if (isinstance(target, Member) and not group) else group
         if not group:
             raise ValueError("Missing necessary argument: group")
 
-        result = await self.adapter.call(
-            self,
-            "sendTempMessage",
-            "post",
-            {
-                "group": int(group),
-                "qq": int(target),
-                "messageChain": _message.to_elements(),
-                **({"quote": _quote} if _quote else {}),
-            },
-        )
-        return type_validate_python(
+        params = {
+            "group": int(group),
+            "qq": int(target),
+            "messageChain": elements,
+        }
+        if _quote:
+            params["quote"] = _quote
+        result = await self.adapter.call(self, "sendTempMessage", "post", params)
+        return _active_message(
             ActiveTempMessage,
-            {
-                "messageChain": message,
-                "message_id": result["messageId"],
-                "subject": (
-                    target
-                    if isinstance(target, Member)
-                    else await self.get_member(group=int(group), target=int(target))
-                ),
-            },
+            _message,
+            elements,
+            result["messageId"],
+            target if isinstance(target, Member) else await self._known_member(int(group), int(target)),
         )
 
     @API
@@ -416,7 +596,7 @@ class Bot(BaseBot):
         Returns:
             str: 版本信息.
         """
-        result = await self.adapter.call(self, "about", "get", session=False)
+        result = await self._call_get("about", session=False)
         return result["version"]
 
     @API
@@ -504,7 +684,7 @@ class Bot(BaseBot):
                 "size": size,
             },
         )
-        return [type_validate_python(FileInfo, i) for i in result]
+        return _validate_file_list(result)
 
     @API
     async def get_file_info(
@@ -528,8 +708,7 @@ class Bot(BaseBot):
         if isinstance(target, Friend):
             raise NotImplementedError("Not implemented for friend")
 
-        target = target.id if isinstance(target, Friend) else target
-        target = target.id if isinstance(target, Group) else target
+        target = int(target)
 
         result = await self.adapter.call(
             self,
@@ -566,8 +745,7 @@ class Bot(BaseBot):
         if isinstance(target, Friend):
             raise NotImplementedError("Not implemented for friend")
 
-        target = target.id if isinstance(target, Friend) else target
-        target = target.id if isinstance(target, Group) else target
+        target = int(target)
 
         result = await self.adapter.call(
             self,
@@ -602,8 +780,7 @@ class Bot(BaseBot):
         if isinstance(target, Friend):
             raise NotImplementedError("Not implemented for friend")
 
-        target = target.id if isinstance(target, Friend) else target
-        target = target.id if isinstance(target, Group) else target
+        target = int(target)
 
         await self.adapter.call(
             self,
@@ -637,8 +814,7 @@ class Bot(BaseBot):
         if isinstance(target, Friend):
             raise NotImplementedError("Not implemented for friend")
 
-        target = target.id if isinstance(target, Friend) else target
-        target = target.id if isinstance(target, Group) else target
+        target = int(target)
 
         await self.adapter.call(
             self,
@@ -673,8 +849,7 @@ class Bot(BaseBot):
         if isinstance(target, Friend):
             raise NotImplementedError("Not implemented for friend")
 
-        target = target.id if isinstance(target, Friend) else target
-        target = target.id if isinstance(target, Group) else target
+        target = int(target)
 
         await self.adapter.call(
             self,
@@ -687,10 +862,54 @@ class Bot(BaseBot):
             },
         )
 
+    async def _call_get(self, action: str, params: Optional[dict] = None, *, session: bool = True) -> Any:
+        """调用幂等的查询接口, 与进行中的相同请求合并为一次调用"""
+        key = (action, session, tuple((params or {}).items()))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.adapter.call(self, action, "get", params, session=session))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 单个调用者被取消时不影响其他等待同一请求的调用者
+        return await asyncio.shield(task)
+
+    async def _version_at_least(self, version: tuple[int, ...]) -> bool:
+        """判断 Mirai API HTTP 版本是否不低于指定版本"""
+        if self._version is None:
+            self._version = tuple(map(int, (await self.get_version()).split(".")))
+        return self._version >= version
+
+    async def _requires_message_target(self) -> bool:
+        """通过消息 ID 操作消息时是否需要同时提供消息所在的目标"""
+        if self._message_target is None:
+            self._message_target = await self._version_at_least((2, 6, 0))
+        return self._message_target
+
+    async def _known_friend(self, target: int) -> Friend:
+        """获取好友信息, 优先使用已获取过的结果"""
+        if (friend := self._friends.get(target)) is None:
+            friend = self._friends[target] = await self.get_friend(target=target)
+        return friend
+
+    async def _known_group(self, target: int) -> Group:
+        """获取群组信息, 优先使用已获取过的结果"""
+        if (group := self._groups.get(target)) is None:
+            group = self._groups[target] = await self.get_group(target=target)
+        return group
+
+    async def _known_member(self, group: int, target: int) -> Member:
+        """获取群成员信息, 优先使用已获取过的结果"""
+        if (member := self._members.get((group, target))) is None:
+            member = await self.get_member(group=group, target=target)
+            if len(self._members) >= _MAX_KNOWN_MEMBERS:
+                del self._members[next(iter(self._members))]
+            self._members[group, target] = member
+        return member
+
     @staticmethod
     def _upload_method(method: Union[UploadMethod, Event]):
         if isinstance(method, UploadMethod):
-            return str(method).lower()
+            return method.value
         if isinstance(method, (FriendMessage, FriendEvent)):
             return "friend"
         if isinstance(method, (GroupMessage, GroupEvent, MemberEvent)):
@@ -734,20 +953,18 @@ class Bot(BaseBot):
         if "/" in path and not name:
             path, name = path.rsplit("/", 1)
 
-        if isinstance(data, os.PathLike):
-            data = open(data, "rb")
-
-        result = await self.adapter.call(
-            self,
-            "file_upload",
-            "multipart",
-            {
-                "type": _method,
-                "target": str(target),
-                "path": path,
-                "file": {"value": data, **({"filename": name} if name else {})},
-            },
-        )
+        with await _open_file(data) as file:
+            result = await self.adapter.call(
+                self,
+                "file_upload",
+                "multipart",
+                {
+                    "type": _method,
+                    "target": str(target),
+                    "path": path,
+                    "file": {"value": file, **({"filename": name} if name else {})},
+                },
+            )
 
         return type_validate_python(FileInfo, result)
 
@@ -773,19 +990,17 @@ class Bot(BaseBot):
 
         _method = self._upload_method(method)
 
-        if isinstance(data, os.PathLike):
-            data = open(data, "rb")
-
-        result = await self.adapter.call(
-            self,
-            "uploadImage",
-            "multipart",
-            {
-                "type": _method,
-                "img": data,
-                "url": url,
-            },
-        )
+        with await _open_file(data) as file:
+            result = await self.adapter.call(
+                self,
+                "uploadImage",
+                "multipart",
+                {
+                    "type": _method,
+                    "img": file,
+                    "url": url,
+                },
+            )
 
         return Image.parse(result)
 
@@ -811,19 +1026,17 @@ class Bot(BaseBot):
 
         _method = self._upload_method(method)
 
-        if isinstance(data, os.PathLike):
-            data = open(data, "rb")
-
-        result = await self.adapter.call(
-            self,
-            "uploadVoice",
-            "multipart",
-            {
-                "type": _method,
-                "voice": data,
-                "url": url,
-            },
-        )
+        with await _open_file(data) as file:
+            result = await self.adapter.call(
+                self,
+                "uploadVoice",
+                "multipart",
+                {
+                    "type": _method,
+                    "voice": file,
+                    "url": url,
+                },
+            )
 
         return Voice.parse(result)
 
@@ -846,21 +1059,17 @@ class Bot(BaseBot):
         """
         _method = self._upload_method(method)
 
-        if isinstance(data, os.PathLike):
-            data = open(data, "rb")
-        if isinstance(thumbnail, os.PathLike):
-            thumbnail = open(thumbnail, "rb")
-
-        result = await self.adapter.call(
-            self,
-            "uploadShortVideo",
-            "multipart",
-            {
-                "type": _method,
-                "video": data,
-                "thumbnail": thumbnail,
-            },
-        )
+        with await _open_file(data) as file, await _open_file(thumbnail) as thumbnail_file:
+            result = await self.adapter.call(
+                self,
+                "uploadShortVideo",
+                "multipart",
+                {
+                    "type": _method,
+                    "video": file,
+                    "thumbnail": thumbnail_file,
+                },
+            )
 
         return Video.parse(result)
 
@@ -894,7 +1103,7 @@ class Bot(BaseBot):
             },
         )
 
-        return [type_validate_python(Announcement, announcement) for announcement in result]
+        return _validate_announcement_list(result)
 
     @API
     async def publish_announcement(
@@ -942,10 +1151,9 @@ class Bot(BaseBot):
         if image:
             if isinstance(image, bytes):
                 data["imageBase64"] = base64.b64encode(image).decode("ascii")
-            elif isinstance(image, os.PathLike):
-                data["imageBase64"] = base64.b64encode(open(image, "rb").read()).decode("ascii")
-            elif isinstance(image, io.IOBase):
-                data["imageBase64"] = base64.b64encode(image.read()).decode("ascii")
+            elif isinstance(image, (os.PathLike, io.IOBase)):
+                # 读取文件可能阻塞, 在线程中进行
+                data["imageBase64"] = await asyncio.to_thread(_b64encode_file, image)  # type: ignore
             elif isinstance(image, str):
                 data["imageUrl"] = image
 
@@ -990,7 +1198,7 @@ class Bot(BaseBot):
         Returns:
             None: 没有返回.
         """
-        friend_id = target.id if isinstance(target, Friend) else target
+        friend_id = int(target)
 
         await self.adapter.call(
             self,
@@ -1000,6 +1208,7 @@ class Bot(BaseBot):
                 "target": friend_id,
             },
         )
+        self._friends.pop(friend_id, None)
 
     @API
     async def mute_member(self, *, group: Union[Group, int], member: Union[Member, int], time: int) -> None:
@@ -1028,12 +1237,32 @@ class Bot(BaseBot):
             "mute",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
-                "memberId": member.id if isinstance(member, Member) else member,
+                "target": int(group),
+                "memberId": int(member),
                 "time": time,
             },
         )
 
+    @API
+    async def mute_members(
+        self, *, group: Union[Group, int], members: Iterable[Union[Member, int]], time: int
+    ) -> None:
+        """
+        在指定群组禁言多个群成员, 各请求并发进行; 规则与 `mute_member` 相同.
+
+        Args:
+            group (Union[Group, int]): 指定的群组
+            members (Iterable[Union[Member, int]]): 指定的群成员
+            time (int): 禁言事件, 单位秒, 修正规则: `0 < time <= 2592000`
+
+        Raises:
+            PermissionError: 没有相应操作权限.
+
+        Returns:
+            None: 没有返回.
+        """
+        await asyncio.gather(*(self.mute_member(group=group, member=member, time=time) for member in members))
+
     @API
     async def unmute_member(self, *, group: Union[Group, int], member: Union[Member, int]) -> None:
         """
@@ -1056,11 +1285,30 @@ class Bot(BaseBot):
             "unmute",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
-                "memberId": member.id if isinstance(member, Member) else member,
+                "target": int(group),
+                "memberId": int(member),
             },
         )
 
+    @API
+    async def unmute_members(
+        self, *, group: Union[Group, int], members: Iterable[Union[Member, int]]
+    ) -> None:
+        """
+        在指定群组解除对多个群成员的禁言, 各请求并发进行; 规则与 `unmute_member` 相同.
+
+        Args:
+            group (Union[Group, int]): 指定的群组
+            members (Iterable[Union[Member, int]]): 指定的群成员
+
+        Raises:
+            PermissionError: 没有相应操作权限.
+
+        Returns:
+            None: 没有返回.
+        """
+        await asyncio.gather(*(self.unmute_member(group=group, member=member) for member in members))
+
     @API
     async def mute_all(self, *, group: Union[Group, int]) -> None:
         """在指定群组开启全体禁言, 需要当前会话账号在指定群主有相应权限(管理员或者群主权限)
@@ -1076,7 +1324,7 @@ class Bot(BaseBot):
             "muteAll",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
+                "target": int(group),
             },
         )
 
@@ -1095,7 +1343,7 @@ class Bot(BaseBot):
             "unmuteAll",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
+                "target": int(group),
             },
         )
 
@@ -1115,17 +1363,48 @@ class Bot(BaseBot):
         Returns:
             None: 没有返回.
         """
+        group_id = int(group)
+        member_id = int(member)
         await self.adapter.call(
             self,
             "kick",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
-                "memberId": member.id if isinstance(member, Member) else member,
+                "target": group_id,
+                "memberId": member_id,
                 "msg": message,
                 "block": block,
             },
         )
+        self._members.pop((group_id, member_id), None)
+
+    @API
+    async def kick_members(
+        self,
+        *,
+        group: Union[Group, int],
+        members: Iterable[Union[Member, int]],
+        message: str = "",
+        block: bool = False,
+    ) -> None:
+        """
+        将多个群组成员从指定群组踢出, 各请求并发进行; 需要具有相应权限(管理员/群主)
+
+        Args:
+            group (Union[Group, int]): 指定的群组
+            members (Iterable[Union[Member, int]]): 指定的群成员
+            message (str, optional): 对踢出对象要展示的消息
+            block (bool, optional): 是否不再接受这些成员加群申请
+
+        Returns:
+            None: 没有返回.
+        """
+        await asyncio.gather(
+            *(
+                self.kick_member(group=group, member=member, message=message, block=block)
+                for member in members
+            )
+        )
 
     @API
     async def quit_group(self, *, group: Union[Group, int]) -> None:
@@ -1138,14 +1417,18 @@ class Bot(BaseBot):
         Returns:
             None: 没有返回.
         """
+        group_id = int(group)
         await self.adapter.call(
             self,
             "quit",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
+                "target": group_id,
             },
         )
+        self._groups.pop(group_id, None)
+        for key in [key for key in self._members if key[0] == group_id]:
+            del self._members[key]
 
     @API
     async def set_essence(
@@ -1166,23 +1449,10 @@ class Bot(BaseBot):
         Returns:
             None: 没有返回.
         """
-        if isinstance(message, GroupMessage):
-            target = message.sender.group
-        elif isinstance(message, ActiveGroupMessage):
-            target = message.subject
-
-        if tuple(map(int, (await self.get_version()).split("."))) >= (2, 6, 0):
-            if not target:
-                event = current_event.get()
-                if isinstance(event, GroupMessage):
-                    target = event.sender.group
-                elif isinstance(event, ActiveGroupMessage):
-                    target = event.subject
-            if not target:
-                raise ValueError("target is required in version 2.6.0+")
+        if await self._requires_message_target():
             params = {
                 "messageId": int(message),
-                "target": int(target),
+                "target": _resolve_message_target(self, message, target, _GROUP_MESSAGE_TARGETS),
             }
         else:
             params = {
@@ -1202,16 +1472,16 @@ class Bot(BaseBot):
         Returns:
             GroupConfig: 指定群组的群设置
         """
-        result = await self.adapter.call(
-            self,
+        result = await self._call_get(
             "groupConfig",
-            "get",
             {
-                "target": group.id if isinstance(group, Group) else group,
+                "target": int(group),
             },
         )
 
-        return type_validate_python(GroupConfig, {camel_to_snake(k): v for k, v in result.items()})
+        return type_validate_python(
+            GroupConfig, {_GROUP_CONFIG_KEYS.get(k) or camel_to_snake(k): v for k, v in result.items()}
+        )
 
     @API
     async def modify_group_config(self, *, group: Union[Group, int], config: GroupConfig) -> None:
@@ -1229,7 +1499,7 @@ class Bot(BaseBot):
             "groupConfig",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
+                "target": int(group),
                 "config": config.dict_(exclude_unset=True, exclude_none=True, to_camel=True),
             },
         )
@@ -1270,8 +1540,8 @@ class Bot(BaseBot):
             "memberInfo",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
-                "memberId": member.id if isinstance(member, Member) else member,
+                "target": int(group),
+                "memberId": int(member),
                 "info": info.dict_(exclude_none=True, exclude_unset=True),
             },
         )
@@ -1312,8 +1582,8 @@ class Bot(BaseBot):
             "memberAdmin",
             "post",
             {
-                "target": group.id if isinstance(group, Group) else group,
-                "memberId": member.id if isinstance(member, Member) else member,
+                "target": int(group),
+                "memberId": int(member),
                 "assign": assign,
             },
         )
@@ -1351,8 +1621,8 @@ class Bot(BaseBot):
             command (Union[str, Iterable[str]]): 指令字符串.
 
         """
-        if isinstance(command, str):
-            command = command.split(" ")
+        # 连续空白不会产生空参数; 其他可迭代对象需先转为列表才能序列化
+        command = command.split() if isinstance(command, str) else list(command)
         await self.adapter.call(
             self,
             "cmd_execute",
@@ -1362,6 +1632,12 @@ class Bot(BaseBot):
             },
         )
 
+    async def _fetch_friends(self) -> dict[int, Union[Friend, dict]]:
+        """获取好友列表并更新缓存, 各项在使用时才进行校验"""
+        friends = {i["id"]: i for i in await self._call_get("friendList")}
+        self._friend_cache = (time.monotonic(), friends)
+        return friends
+
     @API
     async def get_friend_list(self) -> list[Friend]:
         """获取本实例账号添加的好友列表.
@@ -1369,15 +1645,9 @@ class Bot(BaseBot):
         Returns:
             List[Friend]: 添加的好友.
         """
-        return [
-            type_validate_python(Friend, i)
-            for i in await self.adapter.call(
-                self,
-                "friendList",
-                "get",
-                {},
-            )
-        ]
+        friends = _validate_friend_list(await self._call_get("friendList"))
+        self._friend_cache = (time.monotonic(), {i.id: i for i in friends})
+        return friends
 
     @API
     async def get_friend(self, *, target: int) -> Friend:
@@ -1386,10 +1656,33 @@ class Bot(BaseBot):
         Args:
             target (int): 好友的 QQ 号.
 
+        Raises:
+            UnknownTarget: 好友不存在.
+
         Returns:
             Friend: 指定的好友.
         """
-        return next(i for i in await self.get_friend_list() if i.id == target)
+        cache = self._friend_cache
+        if (
+            cache is None
+            or time.monotonic() - cache[0] >= self.adapter.mirai_config.mirai_roster_cache_ttl
+            # 缓存中不存在时重新获取, 以免遗漏新添加的好友
+            or target not in cache[1]
+        ):
+            friends = await self._fetch_friends()
+        else:
+            friends = cache[1]
+        if (friend := friends.get(target)) is None:
+            raise UnknownTarget(UnknownTarget.__doc__ or "", 5, content=str(target))
+        if not isinstance(friend, Friend):
+            friend = friends[target] = type_validate_python(Friend, friend)
+        return friend
+
+    async def _fetch_groups(self) -> dict[int, Union[Group, dict]]:
+        """获取群组列表并更新缓存, 各项在使用时才进行校验"""
+        groups = {i["id"]: i for i in await self._call_get("groupList")}
+        self._group_cache = (time.monotonic(), groups)
+        return groups
 
     @API
     async def get_group_list(self) -> list[Group]:
@@ -1398,15 +1691,9 @@ class Bot(BaseBot):
         Returns:
             List[Group]: 加入的群组.
         """
-        return [
-            type_validate_python(Group, i)
-            for i in await self.adapter.call(
-                self,
-                "groupList",
-                "get",
-                {},
-            )
-        ]
+        groups = _validate_group_list(await self._call_get("groupList"))
+        self._group_cache = (time.monotonic(), {i.id: i for i in groups})
+        return groups
 
     @API
     async def get_group(self, *, target: int) -> Group:
@@ -1415,10 +1702,27 @@ class Bot(BaseBot):
         Args:
             target (int): 群组的群号.
 
+        Raises:
+            UnknownTarget: 群组不存在.
+
         Returns:
             Group: 指定的群组.
         """
-        return next(i for i in await self.get_group_list() if i.id == target)
+        cache = self._group_cache
+        if (
+            cache is None
+            or time.monotonic() - cache[0] >= self.adapter.mirai_config.mirai_roster_cache_ttl
+            # 缓存中不存在时重新获取, 以免遗漏新加入的群组
+            or target not in cache[1]
+        ):
+            groups = await self._fetch_groups()
+        else:
+            groups = cache[1]
+        if (group := groups.get(target)) is None:
+            raise UnknownTarget(UnknownTarget.__doc__ or "", 5, content=str(target))
+        if not isinstance(group, Group):
+            group = groups[target] = type_validate_python(Group, group)
+        return group
 
     @API
     async def get_member_list(self, *, group: Union[Group, int], cache: bool = True) -> list[Member]:
@@ -1433,13 +1737,10 @@ class Bot(BaseBot):
         """
         group_id = int(group)
 
-        return [
-            type_validate_python(Member, i)
-            for i in await (
-                self.adapter.call(
-                    self,
+        return _validate_member_list(
+            await (
+                self._call_get(
                     "memberList",
-                    "get",
                     {
                         "target": group_id,
                     },
@@ -1455,7 +1756,7 @@ class Bot(BaseBot):
                     },
                 )
             )
-        ]
+        )
 
     @API
     async def get_member(self, *, group: Union[Group, int], target: int) -> Member:
@@ -1471,10 +1772,8 @@ class Bot(BaseBot):
 
         return type_validate_python(
             Member,
-            await self.adapter.call(
-                self,
+            await self._call_get(
                 "memberInfo",
-                "get",
                 {
                     "target": int(group),
                     "memberId": target,
@@ -1489,12 +1788,7 @@ class Bot(BaseBot):
         Returns:
             Profile: 找到的 Profile.
         """
-        result = await self.adapter.call(
-            self,
-            "botProfile",
-            "get",
-            {},
-        )
+        result = await self._call_get("botProfile")
         return type_validate_python(Profile, result)
 
     @API
@@ -1507,10 +1801,8 @@ class Bot(BaseBot):
         Returns:
             Profile: 找到的 Profile.
         """
-        result = await self.adapter.call(
-            self,
+        result = await self._call_get(
             "userProfile",
-            "get",
             {
                 "target": int(target),
             },
@@ -1527,10 +1819,8 @@ class Bot(BaseBot):
         Returns:
             Profile: 找到的 Profile.
         """
-        result = await self.adapter.call(
-            self,
+        result = await self._call_get(
             "friendProfile",
-            "get",
             {
                 "target": int(friend),
             },
@@ -1554,15 +1844,13 @@ class Bot(BaseBot):
         Returns:
             Profile: 找到的 Profile 对象.
         """
-        member_id = member.id if isinstance(member, Member) else member
+        member_id = int(member)
         group = group or (member.group if isinstance(member, Member) else None)
-        group_id = group.id if isinstance(group, Group) else group
-        if not group_id:
+        if not group:
             raise ValueError("Missing necessary argument: group")
-        result = await self.adapter.call(
-            self,
+        group_id = int(group)
+        result = await self._call_get(
             "memberProfile",
-            "get",
             {
                 "target": group_id,
                 "memberId": member_id,
@@ -1592,20 +1880,10 @@ class Bot(BaseBot):
             MessageEvent: 提取的事件.
         """
 
-        if tuple(map(int, (await self.get_version()).split("."))) >= (2, 6, 0):
-            event = current_event.get()
-            if isinstance(event, GroupMessage):
-                target = event.sender.group
-            elif isinstance(event, MessageEvent):
-                target = event.sender
-            elif isinstance(message, ActiveMessage):
-                target = message.subject
-            if not target:
-                raise ValueError("target is required in version 2.6.0+")
-
+        if await self._requires_message_target():
             params = {
                 "messageId": int(message),
-                "target": self.info.account if isinstance(target, OtherClient) else int(target),
+                "target": _resolve_message_target(self, message, target, _MESSAGE_TARGETS),
             }
         else:
             params = {
@@ -1622,15 +1900,15 @@ class Bot(BaseBot):
             raise ValueError(f"Invalid result: {result}")
 
         event_type = result.pop("type")
-        if event_type not in EVENT_CLASSES:
+        if (event_cls := EVENT_CLASSES.get(event_type)) is None:
             log(
                 "WARNING",
                 f"received unsupported event <r><bg #f8bbd0>{event_type}</bg #f8bbd0></r>: {result}",
             )
-            event = type_validate_python(Event, result)
+            event = model_validate(Event, result)
             event.__event_type__ = event_type  # type: ignore
         else:
-            event = type_validate_python(EVENT_CLASSES[event_type], result)
+            event = model_validate(event_cls, result)
         return cast(Union[MessageEvent, ActiveMessage], event)
 
     @API
@@ -1656,30 +1934,10 @@ class Bot(BaseBot):
         Returns:
             None: 没有返回
         """
-        if target is not None:
-            pass
-        elif isinstance(message, GroupMessage):
-            target = message.sender.group
-        elif isinstance(message, MessageEvent):
-            target = message.sender
-        elif isinstance(message, ActiveMessage):
-            target = message.subject
-
-        if tuple(map(int, (await self.get_version()).split("."))) >= (2, 6, 0):
-            if not target:
-                event = current_event.get()
-                if isinstance(event, GroupMessage):
-                    target = event.sender.group
-                elif isinstance(event, MessageEvent):
-                    target = event.sender
-                elif isinstance(message, ActiveMessage):
-                    target = message.subject
-            if not target:
-                raise ValueError("target is required in version 2.6.0+")
-
+        if await self._requires_message_target():
             params = {
                 "messageId": int(message),
-                "target": self.account if isinstance(target, OtherClient) else int(target),
+                "target": _resolve_message_target(self, message, target, _MESSAGE_TARGETS),
             }
         else:
             params = {
@@ -1733,16 +1991,15 @@ class Bot(BaseBot):
         Returns:
             List[FriendMessage]: 漫游消息列表.
         """
-        target = target if isinstance(target, int) else target.id
         result = await self.adapter.call(
             self,
             "roamingMessages",
             "post",
             {
-                "target": target,
-                "start": start.timestamp(),
-                "end": end.timestamp(),
+                "target": int(target),
+                "start": int(start.timestamp()),
+                "end": int(end.timestamp()),
             },
         )
 
-        return [type_validate_python(FriendMessage, i) for i in result]
+        return _validate_friend_message_list(result)
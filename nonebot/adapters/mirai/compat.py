@@ -1,14 +1,56 @@
-from typing import Literal, Optional, overload
+from functools import partial
+from typing import Any, Literal, TypeVar, Callable, Optional, overload
 
+from pydantic import BaseModel
 from nonebot.compat import PYDANTIC_V2
 
-__all__ = ("model_validator", "field_validator")
+__all__ = ("model_validator", "field_validator", "model_construct", "model_validate", "type_validator")
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
 
 
 if PYDANTIC_V2:
+    from pydantic import TypeAdapter
     from pydantic import field_validator as field_validator
     from pydantic import model_validator as model_validator
+
+    def model_construct(model: type[M], **values: Any) -> M:
+        """不经校验直接构造模型"""
+        return model.model_construct(**values)
+
+    def model_validate(model: type[M], data: Any) -> M:
+        """使用模型自身的校验器校验数据, 无需额外构建 TypeAdapter"""
+        return model.model_validate(data)
+
+    def type_validator(type_: Any) -> Callable[[Any], Any]:
+        """生成指定类型的校验函数, 复用首次调用时创建的 TypeAdapter"""
+        adapter: Optional[TypeAdapter] = None
+
+        def validate(data: Any) -> Any:
+            nonlocal adapter
+            if adapter is None:
+                adapter = TypeAdapter(type_)
+            return adapter.validate_python(data)
+
+        return validate
+
 else:
+
+    from pydantic import parse_obj_as
+
+    def model_construct(model: type[M], **values: Any) -> M:
+        """不经校验直接构造模型"""
+        return model.construct(**values)
+
+    def model_validate(model: type[M], data: Any) -> M:
+        """使用模型自身的校验器校验数据"""
+        return model.parse_obj(data)
+
+    def type_validator(type_: Any) -> Callable[[Any], Any]:
+        """生成指定类型的校验函数"""
+        return partial(parse_obj_as, type_)
+
     from pydantic import validator, root_validator
 
     @overload
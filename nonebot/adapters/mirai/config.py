@@ -1,5 +1,5 @@
 from yarl import URL
-from pydantic import Field, BaseModel
+from pydantic import Field, BaseModel, PrivateAttr
 
 
 class ClientInfo(BaseModel):
@@ -17,6 +17,18 @@ class ClientInfo(BaseModel):
     为 False 则会使用 WebSocket 接收事件，使用 HTTP 调用 API
     """
 
+    _urls: dict[str, URL] = PrivateAttr(default_factory=dict)
+    """已生成的 API 地址缓存"""
+
+    def api_url(self, route: str) -> URL:
+        """获取 API 地址, 可直接用于构造请求而无需再次解析
+
+        `route` 中的 `_` 视为路径分隔符, 如 `file_upload` 对应 `file/upload`
+        """
+        if (url := self._urls.get(route)) is None:
+            url = self._urls[route] = URL(f"http://{self.host}:{self.port}") / route.replace("_", "/")
+        return url
+
     def get_url(self, route: str) -> str:
         return str(URL(f"http://{self.host}:{self.port}") / route)
 
@@ -31,3 +43,16 @@ class ClientInfo(BaseModel):
 class Config(BaseModel):
     mirai_clients: list[ClientInfo] = Field(default_factory=list)
     """Mirai 客户端配置"""
+    mirai_event_workers: int = 0
+    """每个账号处理事件的 worker 数量, 为 0 时为每个事件单独创建任务
+
+    启用后同时处理的事件数量不超过该值, 长时间等待的事件处理器会占用一个 worker,
+    所有 worker 均在等待后续事件时事件处理会停滞, 请根据处理器情况设置
+    """
+    mirai_event_queue_size: int = 1024
+    """启用 worker 时每个账号待处理事件的最大数量, 超出时新事件会被丢弃"""
+    mirai_roster_cache_ttl: float = 30.0
+    """好友与群组列表的缓存时间, 单位为秒, 为 0 时不缓存
+
+    收到好友或群组变动的事件时会立即失效
+    """
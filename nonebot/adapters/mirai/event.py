@@ -1,17 +1,16 @@
 """Ariadne 的事件"""
 
 from enum import Enum
-from copy import deepcopy
 from datetime import datetime
 from typing_extensions import override, deprecated
-from typing import TYPE_CHECKING, Any, Union, Literal, TypeVar, Optional
+from typing import TYPE_CHECKING, Any, Union, Literal, TypeVar, ClassVar, Optional
 
 from pydantic import Field
 from nonebot.internal.matcher import current_bot
 from nonebot.internal.adapter import Event as BaseEvent
 
-from .compat import model_validator
 from .message import Quote, Source, Message
+from .compat import field_validator, model_construct, model_validator
 from .model import Group, Friend, Member, Stranger, ModelBase, MemberPerm, OtherClient
 
 
@@ -61,44 +60,51 @@ class Reply(ModelBase):
     origin: Message
 
 
-def generate_message(_, values: dict[str, Any]):
+def generate_message(cls, values: dict[str, Any]):
+    """解析消息链并填充消息相关字段, 作为消息事件的 before 校验器
+
+    首个参数需命名为 `cls`, 以便 pydantic 将其作为类方法调用.
+    """
+    if not isinstance(values, dict):
+        return values
+    # 群消息与临时消息的群组由发送者信息给出, 在此一并处理以免多一次校验器调用
+    if getattr(cls, "__group_from_sender__", False) and "group" not in values:
+        values["group"] = values["sender"]["group"]
     chain: list[dict[str, Any]] = values["messageChain"]
-    removed = set()
-    for index, element in enumerate(chain[:2]):
-        if isinstance(element, Source):
-            values["message_id"] = element.data["id"]
-            values["time"] = (
-                datetime.fromtimestamp(element.data["time"]) if element.data["time"] else datetime.now()
-            )
-            removed.add(index)
-        elif isinstance(element, Quote):
-            values["reply"] = Reply(
-                id=element.data["id"],
-                group=element.data["groupId"],
-                sender=element.data["senderId"],
-                target=element.data["targetId"],
-                origin=Message.from_elements(element.data["origin"]),
-            )
-            removed.add(index)
+    # 来源与引用元素只会出现在消息链的前两项, 通常连续位于开头, 可直接切片移除
+    head = 0
+    # 第一项不是来源或引用元素时, 第二项需要单独移除
+    drop_second = False
+    for index in range(min(2, len(chain))):
+        element = chain[index]
+        if isinstance(element, (Source, Quote)):
+            element_type, data = element.__element_type__[0], element.data
         elif isinstance(element, dict):
-            if element.get("type", "Unknown") == "Source":
-                values["message_id"] = element["id"]
-                values["time"] = (
-                    datetime.fromtimestamp(element["time"]) if element.get("time") else datetime.now()
-                )
-                removed.add(index)
-            elif element.get("type", "Unknown") == "Quote":
-                values["reply"] = Reply(
-                    id=element["id"],
-                    group=element["groupId"],
-                    sender=element["senderId"],
-                    target=element["targetId"],
-                    origin=Message.from_elements(element["origin"]),
-                )
-                removed.add(index)
-    values["messageChain"] = [element for index, element in enumerate(chain) if index not in removed]
+            element_type, data = element.get("type"), element
+        else:
+            continue
+        if element_type == "Source":
+            values["message_id"] = data["id"]
+            values["time"] = datetime.fromtimestamp(data["time"]) if data.get("time") else datetime.now()
+        elif element_type == "Quote":
+            # 引用信息来自 Mirai 的消息链, 字段类型已确定, 无需再次校验
+            values["reply"] = model_construct(
+                Reply,
+                id=data["id"],
+                group=data["groupId"],
+                sender=data["senderId"],
+                target=data["targetId"],
+                origin=Message.from_elements(data["origin"]),
+            )
+        else:
+            continue
+        if index == head:
+            head += 1
+        else:
+            drop_second = True
+    values["messageChain"] = [chain[0], *chain[2:]] if drop_second else chain[head:]
     values["message"] = Message.from_elements(values["messageChain"])
-    values["original_message"] = deepcopy(values["message"])
+    values["original_message"] = values["message"]._snapshot()
     return values
 
 
@@ -126,6 +132,9 @@ class MessageEvent(Event):
         message: Message
         original_message: Message
 
+    __group_from_sender__: ClassVar[bool] = False
+    """是否从发送者信息中取得 `group` 字段"""
+
     __setter = model_validator(mode="before")(generate_message)
 
     def __int__(self):
@@ -166,16 +175,12 @@ class GroupMessage(MessageEvent):
     """群消息事件"""
 
     __event_type__ = "GroupMessage"
+    __group_from_sender__ = True
 
     sender: Member
 
     group: Group
 
-    @model_validator(mode="before")
-    def get_group(cls, values: dict[str, Any]):
-        values["group"] = values["sender"]["group"]
-        return values
-
     @override
     def get_session_id(self) -> str:
         return f"{self.group.id}_{self.sender.id}"
@@ -186,16 +191,12 @@ class TempMessage(MessageEvent):
     """临时消息事件"""
 
     __event_type__ = "TempMessage"
+    __group_from_sender__ = True
 
     sender: Member
 
     group: Group
 
-    @model_validator(mode="before")
-    def get_group(cls, values: dict[str, Any]):
-        values["group"] = values["sender"]["group"]
-        return values
-
     @override
     def get_session_id(self) -> str:
         return f"{self.group.id}_{self.sender.id}"
@@ -635,6 +636,15 @@ class GroupRecallEvent(GroupEvent):
         return f"{self.group.id}_{self.author_id}"
 
 
+_NUDGE_SCENES: dict[type, Literal["group", "friend", "stranger", "client"]] = {
+    Group: "group",
+    Friend: "friend",
+    Stranger: "stranger",
+    OtherClient: "client",
+}
+"""双击头像事件来源类型到发生场景的映射"""
+
+
 class NudgeEvent(NoticeEvent):
     """Bot 账号被某个账号在相应上下文区域进行 "双击头像"(Nudge) 的行为.
 
@@ -661,16 +671,12 @@ class NudgeEvent(NoticeEvent):
     @property
     def scene(self) -> Literal["group", "friend", "stranger", "client"]:
         """双击头像的发生场景"""
-        if isinstance(self.subject, Group):
-            return "group"
-        elif isinstance(self.subject, Friend):
-            return "friend"
-        elif isinstance(self.subject, Stranger):
-            return "stranger"
-        elif isinstance(self.subject, OtherClient):
-            return "client"
-        else:
-            return self.subject["kind"]
+        subject = self.subject
+        if (scene := _NUDGE_SCENES.get(type(subject))) is not None:
+            return scene
+        if isinstance(subject, dict):
+            return subject["kind"]
+        return next(scene for cls, scene in _NUDGE_SCENES.items() if isinstance(subject, cls))
 
 
 @register_event_class
@@ -1146,6 +1152,10 @@ class ClientKind(int, Enum):
     WINPHONE = 65804
 
 
+_CLIENT_KINDS = frozenset(ClientKind._value2member_map_)
+"""已知的设备类型值"""
+
+
 @register_event_class
 class OtherClientOnlineEvent(NoticeEvent):
     """Bot 账号在其他客户端上线."""
@@ -1156,7 +1166,12 @@ class OtherClientOnlineEvent(NoticeEvent):
     """上线的客户端"""
 
     kind: Optional[ClientKind] = None
-    """客户端类型"""
+    """客户端类型, 未知的类型视为 None"""
+
+    @field_validator("kind", mode="before")
+    def _(cls, val: Any):
+        # 新增的设备类型不应导致整个事件校验失败
+        return val if val in _CLIENT_KINDS else None
 
 
 @register_event_class
@@ -76,6 +76,15 @@ class ApiNotAvailable(BaseApiNotAvailable, MiraiAdapterException):
         """错误原因"""
 
 
+class NetworkError(BaseNetworkError, MiraiAdapterException):
+    """网络错误: 与 mirai-api-http 的连接已断开."""
+
+    def __init__(self, msg: Optional[str] = None):
+        super().__init__()
+        self.msg: Optional[str] = msg
+        """错误原因"""
+
+
 class RemoteException(BaseNetworkError, MiraiAdapterException):
     """网络异常: 无头客户端处发生错误, 你应该检查其输出的错误日志."""
 
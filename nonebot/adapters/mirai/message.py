@@ -17,7 +17,7 @@ from .model import Member
 class MessageSegment(BaseMessageSegment["Message"]):
     __element_type__: ClassVar[tuple[str, str]]
     __mapping__: ClassVar[dict[str, str]] = {}
-    __rmapping__: ClassVar[dict[str, str]]
+    __rmapping__: ClassVar[dict[str, str]] = {}
 
     def __init_subclass__(cls, **kwargs):
         if "element_type" in kwargs:
@@ -773,3 +773,25 @@ class Message(BaseMessage[MessageSegment]):
         for seg in self:
             res.append(seg.dump())
         return res
+
+    def _to_send_elements(self) -> tuple[Optional[int], list[dict]]:
+        """单次遍历取出首个回复的消息 ID, 并生成发送用的消息元素
+
+        回复、来源与引用元素不会被发送.
+        """
+        reply_id = None
+        res = []
+        for seg in self:
+            if seg.type == "$mirai:reply":
+                if reply_id is None:
+                    reply_id = seg.data["id"]
+            elif seg.type != "source" and seg.type != "quote":
+                res.append(seg.dump())
+        return reply_id, res
+
+    def _snapshot(self) -> "Message":
+        """复制消息链及各消息段的数据字典, 用于保存处理前的原始消息
+
+        消息处理只会增删消息段或替换其数据中的值, 无需进行深拷贝.
+        """
+        return Message(type(seg)(seg.type, seg.data.copy()) for seg in self)
@@ -1,12 +1,18 @@
 import json
 from datetime import datetime
-from functools import partial
+from functools import cache, partial
 from collections.abc import Awaitable, Generator
 from typing_extensions import ParamSpec, Concatenate
-from typing import TYPE_CHECKING, Any, Generic, TypeVar, Callable, Optional, overload
+from typing import TYPE_CHECKING, Any, Union, Generic, TypeVar, Callable, Optional, overload
 
+from nonebot.log import logger
 from nonebot.utils import logger_wrapper
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 if TYPE_CHECKING:
     from .bot import Bot
 
@@ -16,6 +22,13 @@ R = TypeVar("R")
 P = ParamSpec("P")
 log = logger_wrapper("Mirai")
 
+_DEBUG_LEVEL = logger.level("DEBUG").no
+
+
+def debug_enabled(log_level: Union[str, int]) -> bool:
+    """配置的日志等级是否会输出 DEBUG 日志, 判断方式与 NoneBot 默认日志过滤器一致"""
+    return (logger.level(log_level).no if isinstance(log_level, str) else log_level) <= _DEBUG_LEVEL
+
 
 class API(Generic[B, P, R]):
     def __init__(self, func: Callable[Concatenate[B, P], Awaitable[R]]) -> None:
@@ -23,6 +36,10 @@ class API(Generic[B, P, R]):
 
     def __set_name__(self, owner: type[B], name: str) -> None:
         self.name = name
+        # 登记到所属类的 API 映射中, 子类使用各自的副本
+        if "_api_handlers" not in owner.__dict__:
+            owner._api_handlers = {**getattr(owner, "_api_handlers", {})}  # type: ignore
+        owner._api_handlers[name] = self  # type: ignore
 
     @overload
     def __get__(self, obj: None, objtype: type[B]) -> "API[B, P, R]": ...
@@ -58,15 +75,44 @@ def gen_subclass(cls: type[T]) -> Generator[type[T], None, None]:
         yield from gen_subclass(sub_cls)
 
 
-class DatetimeJsonEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return int(obj.timestamp())
-        return json.JSONEncoder.default(self, obj)
+def json_default(obj: Any) -> Any:
+    """序列化 JSON 时处理 datetime 与数据模型"""
+    from .model import ModelBase
+
+    if isinstance(obj, datetime):
+        return int(obj.timestamp())
+    if isinstance(obj, ModelBase):
+        return obj.dict_()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+if orjson is not None:
 
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为 JSON, 返回 UTF-8 编码的 bytes"""
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
 
-def exclude_none(data: dict[str, Any]) -> dict[str, Any]:
-    return {k: v for k, v in data.items() if v is not None}
+    def json_dumps_str(obj: Any) -> str:
+        """序列化为 JSON 字符串, 用于 websocket 文本帧"""
+        return json_dumps(obj).decode("utf-8")
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """反序列化 JSON"""
+        return orjson.loads(data)
+
+else:
+
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为 JSON, 返回 UTF-8 编码的 bytes"""
+        return json_dumps_str(obj).encode("utf-8")
+
+    def json_dumps_str(obj: Any) -> str:
+        """序列化为 JSON 字符串, 用于 websocket 文本帧"""
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """反序列化 JSON"""
+        return json.loads(data)
 
 
 def camel_to_snake(name: str) -> str:
@@ -81,8 +127,12 @@ def camel_to_snake(name: str) -> str:
     return name
 
 
+@cache
 def snake_to_camel(name: str, capital: bool = False) -> str:
-    """将 snake_case 字符串转换为 camelCase 字符串"""
+    """将 snake_case 字符串转换为 camelCase 字符串
+
+    字段名集合有限, 结果会被缓存
+    """
     name = "".join(seg.capitalize() for seg in name.split("_"))
     if not capital:
         name = name[0].lower() + name[1:]
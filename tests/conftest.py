@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import nonebot
+import nonebot.adapters
+
+nonebot.adapters.__path__.append(  # type: ignore
+    str((Path(__file__).parent.parent / "nonebot" / "adapters").resolve())
+)
+
+nonebot.init(driver="~none+~httpx+~websockets")
@@ -0,0 +1,98 @@
+import json
+import asyncio
+import contextlib
+from typing import Optional
+
+import pytest
+from nonebot.log import logger
+from nonebot.exception import WebSocketClosed
+
+import nonebot
+from nonebot.adapters.mirai import Bot, Adapter
+from nonebot.adapters.mirai.config import ClientInfo
+
+
+def test_reconnect_network_error_is_brief():
+    records = []
+    handler = logger.add(records.append, level=0, format="{message}")
+
+    @contextlib.asynccontextmanager
+    async def websocket(req):
+        raise ConnectionRefusedError(111, "Connection refused")
+        yield
+
+    async def main():
+        adapter = Adapter(nonebot.get_driver())
+        adapter.websocket = websocket  # type: ignore
+        task = asyncio.create_task(adapter.ws(ClientInfo(account=1, verify_key="key")))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(main())
+    finally:
+        logger.remove(handler)
+
+    errors = [r.record for r in records if r.record["level"].name == "ERROR"]
+    assert len(errors) == 1
+    assert errors[0]["exception"] is None
+    assert "ConnectionRefusedError" in errors[0]["message"]
+
+
+class FakeWebSocket:
+    """依次返回预设数据的 websocket, 数据为 `None` 时断开连接"""
+
+    def __init__(self, *frames: Optional[dict]):
+        self.frames: asyncio.Queue[Optional[dict]] = asyncio.Queue()
+        self.frames.put_nowait({"syncId": "", "data": {"code": 0, "session": "session"}})
+        for frame in frames:
+            self.frames.put_nowait(frame)
+
+    async def send(self, data: str) -> None:
+        pass
+
+    async def receive(self) -> str:
+        if (frame := await self.frames.get()) is None:
+            raise WebSocketClosed(1000)
+        return json.dumps(frame)
+
+
+def test_event_workers_drain_queue_on_disconnect(monkeypatch: pytest.MonkeyPatch):
+    handled = []
+    release = asyncio.Event()
+
+    async def handle_event(self, event):
+        await release.wait()
+        handled.append(event)
+
+    monkeypatch.setattr(Bot, "handle_event", handle_event)
+    event = {"syncId": "-1", "data": {"type": "BotOnlineEvent", "qq": 1}}
+
+    async def main():
+        adapter = Adapter(nonebot.get_driver())
+        adapter.mirai_config.mirai_event_workers = 2
+        ws = FakeWebSocket(event, event, event)
+
+        @contextlib.asynccontextmanager
+        async def websocket(req):
+            yield ws
+            await asyncio.sleep(3600)
+
+        adapter.websocket = websocket  # type: ignore
+        task = asyncio.create_task(adapter.ws(ClientInfo(account=1, verify_key="key", only_ws=True)))
+        await asyncio.sleep(0.05)
+        state = adapter.accounts[1]
+        assert state.event_queue.qsize() == 1
+        ws.frames.put_nowait(None)
+        await asyncio.sleep(0.05)
+        assert 1 not in adapter.accounts
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*state.workers), 1)
+        task.cancel()
+        return state
+
+    state = asyncio.run(main())
+    assert len(handled) == 3
+    assert not any(worker.cancelled() for worker in state.workers)
@@ -0,0 +1,47 @@
+import io
+import base64
+import asyncio
+
+import nonebot
+from nonebot.adapters.mirai import Bot, Adapter
+from nonebot.adapters.mirai.config import ClientInfo
+from nonebot.adapters.mirai.bot import _b64encode_file
+
+
+class ShortReader(io.RawIOBase):
+    """每次最多返回 1000 字节的原始流"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), 1000, len(self.data) - self.pos)
+        buffer[:size] = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return size
+
+
+def test_b64encode_file_short_reads():
+    data = bytes(range(256)) * 1000
+    assert _b64encode_file(ShortReader(data)) == base64.b64encode(data).decode()
+    assert _b64encode_file(io.BytesIO(data)) == base64.b64encode(data).decode()
+    assert _b64encode_file(ShortReader(b"ab")) == base64.b64encode(b"ab").decode()
+
+
+def test_call_api_respects_plain_override():
+    class CustomBot(Bot):
+        async def get_version(self) -> str:
+            return "custom"
+
+    async def main():
+        adapter = Adapter(nonebot.get_driver())
+        bot = CustomBot(adapter, ClientInfo(account=1, verify_key="key"))
+        return await bot.call_api("get_version")
+
+    assert "get_version" in Bot._api_handlers
+    assert "get_version" not in CustomBot._api_handlers
+    assert asyncio.run(main()) == "custom"
@@ -0,0 +1,51 @@
+from nonebot.adapters.mirai import Adapter
+from nonebot.adapters.mirai.message import At, Text
+from nonebot.adapters.mirai.event import Reply, GroupMessage
+
+GROUP_MESSAGE = {
+    "type": "GroupMessage",
+    "sender": {
+        "id": 123456,
+        "memberName": "member",
+        "specialTitle": "",
+        "permission": "MEMBER",
+        "joinTimestamp": 1700000000,
+        "lastSpeakTimestamp": 1700000000,
+        "muteTimeRemaining": 0,
+        "group": {"id": 654321, "name": "group", "permission": "ADMINISTRATOR"},
+    },
+    "messageChain": [
+        {"type": "Source", "id": 10, "time": 1700000000},
+        {
+            "type": "Quote",
+            "id": 9,
+            "groupId": 654321,
+            "senderId": 2333,
+            "targetId": 654321,
+            "origin": [{"type": "Plain", "text": "quoted"}],
+        },
+        {"type": "At", "target": 2333, "display": "@bot"},
+        {"type": "Plain", "text": " hello"},
+    ],
+}
+
+
+def test_group_message():
+    event = Adapter.json_to_event(
+        {**GROUP_MESSAGE, "messageChain": [dict(element) for element in GROUP_MESSAGE["messageChain"]]}
+    )
+    assert isinstance(event, GroupMessage)
+    assert event.message_id == 10
+    assert event.group.id == 654321
+    assert event.sender.id == 123456
+    assert isinstance(event.reply, Reply)
+    assert event.reply.id == 9
+    assert event.reply.sender == 2333
+    assert event.reply.origin.extract_plain_text() == "quoted"
+    assert len(event.message) == 2
+    assert isinstance(event.message[0], At)
+    assert event.message[0].data["target"] == 2333
+    assert isinstance(event.message[1], Text)
+    assert event.message[1].data["text"] == " hello"
+    assert event.original_message == event.message
+    assert event.original_message is not event.message
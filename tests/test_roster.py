@@ -0,0 +1,162 @@
+import asyncio
+from typing import Any, Optional
+
+import pytest
+from nonebot.compat import type_validate_python
+
+import nonebot
+from nonebot.adapters.mirai import Bot, Adapter
+from nonebot.adapters.mirai.config import ClientInfo
+from nonebot.adapters.mirai.model import Group, Member
+from nonebot.adapters.mirai.exception import UnknownTarget
+
+GROUP = {"id": 654321, "name": "group", "permission": "ADMINISTRATOR"}
+FRIEND = {"id": 2333, "nickname": "friend", "remark": ""}
+MEMBER = {"id": 123456, "memberName": "member", "permission": "MEMBER", "group": GROUP}
+RESPONSES: dict[str, Any] = {
+    "friendList": [FRIEND],
+    "groupList": [GROUP],
+    "memberInfo": MEMBER,
+    "sendFriendMessage": {"messageId": 1},
+    "sendGroupMessage": {"messageId": 1},
+    "sendTempMessage": {"messageId": 1},
+}
+
+
+class FakeCall:
+    """记录请求的 `Adapter.call`, 按接口名返回预设数据"""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str, Optional[dict]]] = []
+
+    def count(self, action: str) -> int:
+        return sum(call[0] == action for call in self.calls)
+
+    async def __call__(
+        self, bot: Bot, action: str, method: str, params: Optional[dict] = None, session: bool = True
+    ) -> Any:
+        self.calls.append((action, method, params))
+        # 让出控制权, 使并发的相同请求有机会合并
+        await asyncio.sleep(0)
+        return RESPONSES.get(action)
+
+
+@pytest.fixture
+def bot() -> Bot:
+    adapter = Adapter(nonebot.get_driver())
+    adapter.call = FakeCall()  # type: ignore
+    return Bot(adapter, ClientInfo(account=1, verify_key="key"))
+
+
+def expire(cache: tuple[float, Any], bot: Bot) -> tuple[float, Any]:
+    """将缓存的获取时间提前到缓存时间之外"""
+    return (cache[0] - bot.adapter.mirai_config.mirai_roster_cache_ttl, cache[1])
+
+
+def test_roster_cache_hit(bot: Bot):
+    async def main():
+        assert (await bot.get_friend(target=2333)).nickname == "friend"
+        assert (await bot.get_friend(target=2333)).nickname == "friend"
+        assert (await bot.get_group(target=654321)).name == "group"
+        assert (await bot.get_group(target=654321)).name == "group"
+
+    asyncio.run(main())
+    assert bot.adapter.call.count("friendList") == 1  # type: ignore
+    assert bot.adapter.call.count("groupList") == 1  # type: ignore
+
+
+def test_roster_cache_expires(bot: Bot):
+    async def main():
+        await bot.get_friend(target=2333)
+        bot._friend_cache = expire(bot._friend_cache, bot)  # type: ignore
+        await bot.get_friend(target=2333)
+        await bot.get_group(target=654321)
+        bot._group_cache = expire(bot._group_cache, bot)  # type: ignore
+        await bot.get_group(target=654321)
+
+    asyncio.run(main())
+    assert bot.adapter.call.count("friendList") == 2  # type: ignore
+    assert bot.adapter.call.count("groupList") == 2  # type: ignore
+
+
+def test_roster_unknown_target(bot: Bot):
+    async def main():
+        await bot.get_friend(target=2333)
+        with pytest.raises(UnknownTarget):
+            await bot.get_friend(target=1)
+        with pytest.raises(UnknownTarget):
+            await bot.get_group(target=1)
+
+    asyncio.run(main())
+    # 缓存中不存在时会重新获取一次再判断
+    assert bot.adapter.call.count("friendList") == 2  # type: ignore
+    assert bot.adapter.call.count("groupList") == 1  # type: ignore
+
+
+def test_roster_invalidated_by_friend_event(bot: Bot):
+    async def main():
+        await bot.send_friend_message(target=2333, message="hello")
+        await bot.send_friend_message(target=2333, message="hello")
+        assert bot.adapter.call.count("friendList") == 1  # type: ignore
+        await bot.handle_event(
+            Adapter.json_to_event(
+                {"type": "FriendAddEvent", "friend": {**FRIEND, "id": 2334}, "stranger": False}
+            )
+        )
+        assert bot._friend_cache is None
+        assert not bot._friends
+        await bot.send_friend_message(target=2333, message="hello")
+
+    asyncio.run(main())
+    assert bot.adapter.call.count("friendList") == 2  # type: ignore
+
+
+def test_known_member_evicted_by_member_event(bot: Bot):
+    async def main():
+        await bot.send_temp_message(target=123456, group=654321, message="hello")
+        await bot.send_temp_message(target=123456, group=654321, message="hello")
+        assert bot.adapter.call.count("memberInfo") == 1  # type: ignore
+        await bot.handle_event(
+            Adapter.json_to_event(
+                {"type": "MemberCardChangeEvent", "origin": "", "current": "card", "member": MEMBER}
+            )
+        )
+        assert (654321, 123456) not in bot._members
+        await bot.send_temp_message(target=123456, group=654321, message="hello")
+
+    asyncio.run(main())
+    assert bot.adapter.call.count("memberInfo") == 2  # type: ignore
+
+
+def test_concurrent_requests_are_coalesced(bot: Bot):
+    async def main():
+        return await asyncio.gather(*(bot.get_friend_list() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert bot.adapter.call.count("friendList") == 1  # type: ignore
+    assert all(result[0].id == 2333 for result in results)
+    assert not bot._inflight
+
+
+def test_batch_member_actions(bot: Bot):
+    member = type_validate_python(Member, MEMBER)
+    group = type_validate_python(Group, GROUP)
+
+    async def main():
+        await bot.send_temp_message(target=123456, group=654321, message="hello")
+        assert (654321, 123456) in bot._members
+        await bot.mute_members(group=group, members=[member, 10001], time=60)
+        await bot.mute_members(group=group, members=[member], time=0)
+        await bot.unmute_members(group=654321, members=[123456, 10001])
+        await bot.kick_members(group=654321, members=[member, 10001], message="bye")
+
+    asyncio.run(main())
+    calls = bot.adapter.call.calls  # type: ignore
+    assert sorted(call[2]["memberId"] for call in calls if call[0] == "mute") == [10001, 123456]  # type: ignore
+    assert all(call[2]["time"] == 60 for call in calls if call[0] == "mute")  # type: ignore
+    assert sorted(call[2]["memberId"] for call in calls if call[0] == "unmute") == [10001, 123456]  # type: ignore
+    kicks = [call[2] for call in calls if call[0] == "kick"]
+    assert sorted(kick["memberId"] for kick in kicks) == [10001, 123456]  # type: ignore
+    assert all(kick["msg"] == "bye" for kick in kicks)  # type: ignore
+    # 被踢出的成员不再保留在已知成员中
+    assert (654321, 123456) not in bot._members